@@ -0,0 +1,118 @@
+from typing import Any, Dict, Iterator, List, Union, overload
+
+from .models import SweepSpec
+
+Run = Dict[str, Any]
+
+
+class SweepExpansion:
+    """
+    Lazy view over the Cartesian product of a SweepSpec's parameter values.
+
+    Runs are numbered in mixed radix with the last parameter varying fastest,
+    the same order as itertools.product. Nothing is materialized: len(),
+    indexing and slicing are O(number of parameters), so a sweep with 10^13
+    runs can be counted, paged and sharded cheaply. Slicing returns another
+    SweepExpansion over the selected run indices.
+
+    A spec with no parameters expands to zero runs.
+    """
+
+    def __init__(self, spec: SweepSpec, indices: range = None):
+        self.spec = spec
+        self.keys: List[str] = [p.key for p in spec.parameters]
+        self.values: List[list] = [list(p.values) for p in spec.parameters]
+        self.radices: List[int] = [len(v) for v in self.values]
+
+        total = 0
+        if self.radices:
+            total = 1
+            for radix in self.radices:
+                total *= radix
+        self.total = total
+        self._indices = range(total) if indices is None else indices
+
+    @property
+    def size(self) -> int:
+        """Number of runs in this view; unlike len() it never overflows."""
+        r = self._indices
+        return max(0, (r.stop - r.start + r.step - (1 if r.step > 0 else -1)) // r.step)
+
+    @property
+    def indices(self) -> range:
+        """Absolute run indices covered by this view."""
+        return self._indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, item: int) -> Run: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> "SweepExpansion": ...
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return SweepExpansion(self.spec, self._indices[item])
+        return self.run(self._indices[item])
+
+    def __iter__(self) -> Iterator[Run]:
+        indices = self._indices
+        if indices.step != 1 or not indices:
+            for i in indices:
+                yield self.run(i)
+            return
+
+        # Contiguous views walk an odometer instead of re-decoding every index
+        keys, values, radices = self.keys, self.values, self.radices
+        digits = self.digits(indices.start)
+        last = len(digits) - 1
+        for _ in indices:
+            yield {k: v[d] for k, v, d in zip(keys, values, digits)}
+            p = last
+            while p >= 0:
+                digits[p] += 1
+                if digits[p] < radices[p]:
+                    break
+                digits[p] = 0
+                p -= 1
+
+    def digits(self, index: int) -> List[int]:
+        """Decode an absolute run index into one value position per parameter."""
+        if not 0 <= index < self.total:
+            raise IndexError(f"run index {index} out of range for {self.total} runs")
+        digits = [0] * len(self.radices)
+        for p in range(len(self.radices) - 1, -1, -1):
+            index, digits[p] = divmod(index, self.radices[p])
+        return digits
+
+    def run(self, index: int) -> Run:
+        """Return the parameter assignment for an absolute run index."""
+        return {k: v[d] for k, v, d in zip(self.keys, self.values, self.digits(index))}
+
+    def index_of(self, digits: List[int]) -> int:
+        """Encode value positions (one per parameter) back into a run index."""
+        index = 0
+        for d, radix in zip(digits, self.radices):
+            if not 0 <= d < radix:
+                raise IndexError(f"value position {d} out of range for radix {radix}")
+            index = index * radix + d
+        return index
+
+    def shard(self, shard: int, shards: int) -> "SweepExpansion":
+        """
+        Split this view into `shards` contiguous, near-equal parts and return
+        part number `shard` (0-based).
+        """
+        if shards <= 0 or not 0 <= shard < shards:
+            raise ValueError(f"invalid shard {shard} of {shards}")
+        size = self.size
+        start = size * shard // shards
+        stop = size * (shard + 1) // shards
+        return SweepExpansion(self.spec, self._indices[start:stop])
+
+
+def expand(spec: SweepSpec) -> SweepExpansion:
+    """Lazy Cartesian-product expansion of a spec into simulation runs."""
+    return SweepExpansion(spec)
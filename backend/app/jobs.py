@@ -0,0 +1,224 @@
+import os
+import math
+import asyncio
+import logging
+import importlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .expansion import expand
+from .models import StoredSweep
+
+logger = logging.getLogger(__name__)
+
+Solver = Callable[[Dict[str, Any]], Dict[str, Any]]
+# (ok, solver output or error message) for each run of a batch
+Outcome = Tuple[bool, Any]
+ProgressListener = Callable[["Job"], Awaitable[None]]
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+def stub_solver(params: Dict[str, Any], iterations: int = 20000) -> Dict[str, Any]:
+    """
+    CPU-bound stand-in for a CFD/FEA solver: a deterministic fixed-point
+    iteration seeded from the numeric parameters.
+    """
+    seed = sum(float(v) for v in params.values() if isinstance(v, (int, float)))
+    x = 0.5
+    for _ in range(iterations):
+        x = math.cos(x + seed * 1e-3)
+    return {"objective": x}
+
+
+def load_solver(path: str) -> Solver:
+    """Import a solver from a "package.module:function" path."""
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_batch(solver: Solver, runs: List[Dict[str, Any]]) -> List[Outcome]:
+    """Execute a batch of runs inside a worker; one failing run does not sink the batch."""
+    outcomes: List[Outcome] = []
+    for params in runs:
+        try:
+            outcomes.append((True, solver(params)))
+        except Exception as e:
+            outcomes.append((False, f"{type(e).__name__}: {e}"))
+    return outcomes
+
+
+class Job:
+    """Execution state of one config's runs."""
+
+    def __init__(self, stored: StoredSweep):
+        self.stored = stored
+        self.config_id = str(stored.id)
+        self.total = expand(stored).size
+        self.completed = 0
+        self.failed = 0
+        self.state = QUEUED
+        self.error: Optional[str] = None
+
+    @property
+    def finished_runs(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def progress(self) -> int:
+        if self.state == DONE:
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.finished_runs * 100 // self.total)
+
+    def record(self, outcomes: List[Outcome]) -> None:
+        for ok, _ in outcomes:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> dict:
+        msg = {"progress": self.progress, "state": self.state}
+        if self.error:
+            msg["error"] = self.error
+        return msg
+
+
+class JobScheduler:
+    """
+    Runs the expanded runs of submitted configs on a local executor.
+
+    Runs are shipped to the executor in batches of `batch_size` to amortize
+    IPC, and at most `concurrency` batches are in flight across all jobs, so
+    a ProcessPoolExecutor with as many workers saturates the node while the
+    event loop only awaits futures. Jobs run independently of any viewer;
+    listeners are awaited after every batch and state change.
+    """
+
+    def __init__(
+        self,
+        solver: Solver = stub_solver,
+        concurrency: Optional[int] = None,
+        batch_size: int = 64,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+    ):
+        self.solver = solver
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.executor_factory = executor_factory or (lambda n: ProcessPoolExecutor(max_workers=n))
+        self.jobs: Dict[str, Job] = {}
+        self.listeners: List[ProgressListener] = []
+
+        self._queue: "asyncio.Queue[Job]" = asyncio.Queue()
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._job_tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._executor = self.executor_factory(self.concurrency)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._dispatcher, *self._job_tasks.values()) if t]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._dispatcher = None
+        self._job_tasks.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get(self, config_id: str) -> Optional[Job]:
+        return self.jobs.get(config_id)
+
+    def submit(self, stored: StoredSweep) -> Job:
+        """Enqueue a config's runs; resubmitting a live or finished job returns it."""
+        job = self.jobs.get(str(stored.id))
+        if job and job.state != FAILED:
+            return job
+        job = Job(stored)
+        self.jobs[job.config_id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    async def _notify(self, job: Job) -> None:
+        for listener in self.listeners:
+            try:
+                await listener(job)
+            except Exception:
+                logger.exception("Progress listener failed for config %s", job.config_id)
+
+    async def _dispatch(self) -> None:
+        while True:
+            job = await self._queue.get()
+            task = asyncio.create_task(self._run_job(job))
+            self._job_tasks[job.config_id] = task
+            task.add_done_callback(lambda _, id_=job.config_id: self._job_tasks.pop(id_, None))
+
+    async def _run_job(self, job: Job) -> None:
+        job.state = RUNNING
+        await self._notify(job)
+
+        batches = set()
+        try:
+            runs = expand(job.stored)
+            for start in range(0, runs.size, self.batch_size):
+                await self._slots.acquire()
+                batch = asyncio.create_task(
+                    self._run_batch(job, list(runs[start:start + self.batch_size]))
+                )
+                batches.add(batch)
+                batch.add_done_callback(batches.discard)
+                # Release from the callback so cancelled batches free their slot too
+                batch.add_done_callback(lambda _: self._slots.release())
+            await asyncio.gather(*batches)
+            job.state = DONE
+        except asyncio.CancelledError:
+            for batch in batches:
+                batch.cancel()
+            job.state = CANCELLED
+            raise
+        except Exception as e:
+            logger.exception("Job for config %s failed", job.config_id)
+            for batch in batches:
+                batch.cancel()
+            job.state = FAILED
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            await self._notify(job)
+
+    async def _run_batch(self, job: Job, runs: List[Dict[str, Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        outcomes = await loop.run_in_executor(self._executor, run_batch, self.solver, runs)
+        job.record(outcomes)
+        await self._notify(job)
+
+
+def scheduler_from_env() -> JobScheduler:
+    """Build a scheduler from JOB_SOLVER, JOB_CONCURRENCY and JOB_BATCH_SIZE."""
+    solver_path = os.getenv("JOB_SOLVER")
+    concurrency = os.getenv("JOB_CONCURRENCY")
+    return JobScheduler(
+        solver=load_solver(solver_path) if solver_path else stub_solver,
+        concurrency=int(concurrency) if concurrency else None,
+        batch_size=int(os.getenv("JOB_BATCH_SIZE", "64")),
+    )
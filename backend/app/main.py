@@ -1,19 +1,41 @@
 import os
 import asyncio
+from contextlib import asynccontextmanager, suppress
 from uuid import UUID
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
 
 from .models import SweepSpec, StoredSweep
-from .storage import save_spec, get_spec, list_ids, list_recent_ids
+from .expansion import expand
+from .runmatrix import DEFAULT_CHUNK_SIZE, iter_npy, run_matrix
+from .jobs import Job, scheduler_from_env
+from .storage import (
+    save_spec, get_spec, get_spec_json, get_specs_many, list_ids, list_recent_ids,
+    watch_invalidations,
+)
 
 from collections import defaultdict
-from typing import Dict, Set #Python 3.8
+from typing import Dict, Optional, Set #Python 3.8
+
+# Executes submitted configs; progress is pushed to viewers via broadcast
+scheduler = scheduler_from_env()
+
 
-app = FastAPI(title="Parameter Sweep API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep this worker's spec cache coherent with writes from other workers
+    invalidation_task = asyncio.create_task(watch_invalidations())
+    await scheduler.start()
+    yield
+    await scheduler.stop()
+    invalidation_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await invalidation_task
+
+
+app = FastAPI(title="Parameter Sweep API", lifespan=lifespan)
 
 # Allow CORS from frontend
 app.add_middleware(
@@ -33,10 +55,11 @@ async def root():
 @app.post("/configs")
 async def create_config(spec: SweepSpec):
     """
-    Create a new configuration and return its UUID.
+    Create a new configuration, queue its runs, and return its UUID.
     Pydantic validation occurs automatically.
     """
     id_ = await save_spec(spec)
+    scheduler.submit(StoredSweep(id=id_, **spec.dict()))
     return {"id": str(id_)}
 
 
@@ -47,17 +70,33 @@ async def get_recent_configs(limit: int = 10):
     Each entry includes both the id and the config data.
     """
     ids = await list_recent_ids(limit=limit)
-    recent_configs = []
+    blobs = await get_specs_many(ids, raw=True)
+
+    # Stored blobs are already StoredSweep JSON, so splice them in as-is
+    # instead of parsing and re-encoding every config.
+    recent_configs = [
+        f'{{"id":"{id_}","config":{blob}}}'
+        for id_, blob in zip(ids, blobs)
+        if blob
+    ]
+
+    return Response(content=f"[{','.join(recent_configs)}]", media_type="application/json")
+
+
+def parse_id(id: str) -> UUID:
+    """Parse a config id from the path, raising 400 if it is not a UUID."""
+    try:
+        return UUID(id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid id format")
 
-    for id_ in ids:
-        stored = await get_spec(id_)
-        if stored:
-            recent_configs.append({
-                "id": str(id_),
-                "config": jsonable_encoder(stored)
-            })
 
-    return JSONResponse(content=recent_configs)
+async def get_stored_or_404(id: str) -> StoredSweep:
+    """Load a stored config by path id, raising 400/404 like read_config."""
+    stored = await get_spec(parse_id(id))
+    if not stored:
+        raise HTTPException(status_code=404, detail="Not found")
+    return stored
 
 
 @app.get("/configs/{id}")
@@ -66,23 +105,88 @@ async def read_config(id: str):
     Retrieve a stored configuration by UUID.
     Raises 400 if ID format is invalid, 404 if not found.
     """
-    try:
-        uuid_obj = UUID(id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid id format")
+    uuid_obj = parse_id(id)
 
-    stored: StoredSweep = await get_spec(uuid_obj)
-    if not stored:
+    # Served from the in-process spec cache when hot
+    body = await get_spec_json(uuid_obj)
+    if not body:
         raise HTTPException(status_code=404, detail="Not found")
 
-    return JSONResponse(content=jsonable_encoder(stored))
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/configs/{id}/runs")
+async def read_config_runs(
+    id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Page through the runs (Cartesian product of parameter values) of a config.
+    `total` is computed without expanding the sweep, and each run carries its
+    absolute index so pages can be fetched or sharded independently.
+    """
+    stored = await get_stored_or_404(id)
+
+    runs = expand(stored)
+    page = runs[offset:offset + limit]
+    return {
+        "id": str(stored.id),
+        "total": runs.size,
+        "offset": offset,
+        "limit": limit,
+        "runs": [
+            {"index": index, "params": params}
+            for index, params in zip(page.indices, page)
+        ],
+    }
+
+
+def build_run_matrix(stored: StoredSweep):
+    """Build the run matrix of a config, reporting bad parameter values as 422."""
+    try:
+        return run_matrix(stored)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.get("/configs/{id}/matrix")
+async def read_config_matrix_schema(id: str):
+    """
+    Describe the column-oriented run matrix of a config: column order,
+    NumPy dtypes, and the categories that enum/string codes index into.
+    """
+    stored = await get_stored_or_404(id)
+    return {"id": str(stored.id), **build_run_matrix(stored).schema()}
+
+
+@app.get("/configs/{id}/matrix.npy")
+async def stream_config_matrix(
+    id: str,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=1_048_576),
+):
+    """
+    Stream runs [offset, offset + limit) as concatenated .npy arrays: for each
+    chunk, one array per column in the order given by /configs/{id}/matrix.
+    Read it back with repeated np.load() calls on the response stream.
+    """
+    stored = await get_stored_or_404(id)
+    matrix = build_run_matrix(stored)
+    stop = None if limit is None else offset + limit
+
+    # Sync generator: Starlette iterates it in a threadpool, off the event loop
+    return StreamingResponse(
+        iter_npy(matrix.chunks(chunk_size, start=offset, stop=stop)),
+        media_type="application/octet-stream",
+        headers={"X-Run-Columns": ",".join(matrix.keys)},
+    )
 
 
 # Track active WebSocket connections per config ID
 active_connections: Dict[str, Set[WebSocket]] = defaultdict(set)
 
-# Store the latest progress per config ID
-latest_progress: Dict[str, dict] = {}
 
 async def broadcast(config_id: str, message: dict):
     """Send message to all connected clients for a given config_id"""
@@ -91,7 +195,33 @@ async def broadcast(config_id: str, message: dict):
         try:
             await ws.send_json(message)
         except Exception:
-            connections.remove(ws)
+            connections.discard(ws)
+
+
+async def publish_progress(job: Job):
+    """Scheduler listener: push job progress to the config's viewers, if any."""
+    if active_connections.get(job.config_id):
+        viewers = len(active_connections[job.config_id])
+        await broadcast(job.config_id, {**job.snapshot(), "viewers": viewers})
+
+
+scheduler.listeners.append(publish_progress)
+
+
+async def find_or_submit_job(config_id: str) -> Optional[Job]:
+    """
+    Return the job for a config, submitting it if the config exists but has
+    no job in this process yet (e.g. it was created before a restart).
+    """
+    job = scheduler.get(config_id)
+    if job:
+        return job
+    try:
+        stored = await get_spec(UUID(config_id))
+    except ValueError:
+        return None
+    return scheduler.submit(stored) if stored else None
+
 
 @app.websocket("/ws/configs/{config_id}")
 async def ws_config_progress(websocket: WebSocket, config_id: str):
@@ -100,49 +230,26 @@ async def ws_config_progress(websocket: WebSocket, config_id: str):
     active_connections[config_id].add(websocket)
 
     try:
-        # Send latest progress immediately to new client
-        if config_id in latest_progress:
-            viewers = len(active_connections[config_id])
-            msg = {**latest_progress[config_id], "viewers": viewers}
-            await websocket.send_json(msg)
+        job = await find_or_submit_job(config_id)
+        state = job.snapshot() if job else {"progress": 0, "state": "NOT_FOUND"}
 
-        else:
-            # Initial state
-            progress = 0
-            state = "QUEUED"
-            viewers = len(active_connections[config_id])
-            latest_progress[config_id] = {"progress": progress, "state": state}
-            await broadcast(config_id, {"progress": progress, "state": state, "viewers": viewers})
-
-        # Mock progress: 0 -> 100 in 20 steps if new job
-        if latest_progress[config_id]["progress"] == 0:
-            progress = 0
-            state = "QUEUED"
-            await asyncio.sleep(1)
-            state = "RUNNING"
-
-            for i in range(1, 21):
-                progress = int(i * 5)
-                progress = min(progress, 100)
-                state = "RUNNING"
-                latest_progress[config_id] = {"progress": progress, "state": state}
-                viewers = len(active_connections[config_id])
-                await broadcast(config_id, {"progress": progress, "state": state, "viewers": viewers})
-                await asyncio.sleep(1)
-
-            state = "DONE"
-            progress = 100
-            latest_progress[config_id] = {"progress": progress, "state": state}
-            viewers = len(active_connections[config_id])
-            await broadcast(config_id, {"progress": progress, "state": state, "viewers": viewers})
+        # Send current state to the new client and the new viewer count to everyone
+        viewers = len(active_connections[config_id])
+        await broadcast(config_id, {**state, "viewers": viewers})
+
+        # The job runs in the scheduler; this handler only waits for the client to leave
+        while True:
+            await websocket.receive_text()
 
     except WebSocketDisconnect:
         print(f"Client disconnected from config {config_id}")
     finally:
-        active_connections[config_id].remove(websocket)
+        active_connections[config_id].discard(websocket)
         viewers = len(active_connections[config_id])
         if viewers > 0:
             # broadcast updated viewers count
-            await broadcast(config_id, {"progress": latest_progress[config_id]["progress"],
-                                        "state": latest_progress[config_id]["state"],
-                                        "viewers": viewers})
\ No newline at end of file
+            job = scheduler.get(config_id)
+            if job:
+                await broadcast(config_id, {**job.snapshot(), "viewers": viewers})
+        else:
+            active_connections.pop(config_id, None)
@@ -0,0 +1,147 @@
+import io
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from .expansion import SweepExpansion, expand
+from .models import SweepSpec
+
+CATEGORICAL_TYPES = ("enum", "string")
+DEFAULT_CHUNK_SIZE = 65536
+
+# Strides up to this size keep `offset + j` safely inside int64
+_INT64_SAFE = 2 ** 62
+
+
+def code_dtype(n_categories: int) -> np.dtype:
+    """Smallest unsigned integer dtype able to index `n_categories` values."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_categories <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+class RunChunk(NamedTuple):
+    start: int  # absolute index of the first run in the chunk
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+
+class RunMatrix:
+    """
+    Column-oriented NumPy view of a sweep's runs.
+
+    `float` parameters become float64 columns and `int` parameters int64
+    columns. `enum` and `string` parameters become integer codes into
+    `categories[key]`, using the smallest unsigned dtype that fits. Columns
+    are computed from run indices with vectorized mixed-radix arithmetic, in
+    the same run order as SweepExpansion.
+    """
+
+    def __init__(self, spec: SweepSpec):
+        self.expansion: SweepExpansion = expand(spec)
+        self.keys = self.expansion.keys
+        self.total = self.expansion.total
+        self.categories: Dict[str, list] = {}
+        self._lookup: Dict[str, Optional[np.ndarray]] = {}
+        self.dtypes: Dict[str, np.dtype] = {}
+
+        for param, values in zip(spec.parameters, self.expansion.values):
+            if param.type in CATEGORICAL_TYPES:
+                self.categories[param.key] = values
+                self._lookup[param.key] = None
+                self.dtypes[param.key] = code_dtype(len(values))
+                continue
+            dtype = np.float64 if param.type == "float" else np.int64
+            try:
+                lookup = np.asarray(values, dtype=dtype)
+            except (TypeError, ValueError):
+                raise ValueError(f"parameter {param.key!r} has non-{param.type} values")
+            if param.type == "int" and not np.array_equal(lookup, np.asarray(values, dtype=np.float64)):
+                raise ValueError(f"parameter {param.key!r} has non-integer values")
+            self._lookup[param.key] = lookup
+            self.dtypes[param.key] = lookup.dtype
+
+        # Stride of parameter p = number of runs between steps of its value
+        self.strides: List[int] = [1] * len(self.keys)
+        for p in range(len(self.keys) - 2, -1, -1):
+            self.strides[p] = self.strides[p + 1] * self.expansion.radices[p + 1]
+
+    def schema(self) -> dict:
+        """JSON-friendly description of the columns, their dtypes and categories."""
+        return {
+            "total": self.total,
+            "columns": [
+                {
+                    "key": key,
+                    "dtype": self.dtypes[key].str,
+                    **({"categories": self.categories[key]} if key in self.categories else {}),
+                }
+                for key in self.keys
+            ],
+        }
+
+    def codes(self, key: str, start: int, n: int) -> np.ndarray:
+        """Value positions of parameter `key` for runs start .. start + n - 1."""
+        p = self.keys.index(key)
+        radix, stride = self.expansion.radices[p], self.strides[p]
+        j = np.arange(n, dtype=np.int64)
+
+        # digit(start + j) = (start // stride + (start % stride + j) // stride) % radix,
+        # split so that only small numbers ever reach int64 arithmetic.
+        high, low = divmod(start, stride)
+        if stride <= _INT64_SAFE:
+            carry = (j + low) // stride
+        elif stride - low < n:
+            carry = (j >= stride - low).astype(np.int64)
+        else:
+            carry = np.zeros(n, dtype=np.int64)
+        return (carry + high % radix) % radix
+
+    def columns(self, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Materialize runs [start, stop) as one array per parameter."""
+        stop = self.total if stop is None else min(stop, self.total)
+        if not 0 <= start <= stop:
+            raise IndexError(f"invalid run range [{start}, {stop}) for {self.total} runs")
+        n = stop - start
+
+        out: Dict[str, np.ndarray] = {}
+        for key in self.keys:
+            codes = self.codes(key, start, n)
+            lookup = self._lookup[key]
+            out[key] = codes.astype(self.dtypes[key]) if lookup is None else lookup[codes]
+        return out
+
+    def chunks(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Iterator[RunChunk]:
+        """Yield runs [start, stop) as RunChunks of at most `chunk_size` rows."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        stop = self.total if stop is None else min(stop, self.total)
+        for chunk_start in range(start, stop, chunk_size):
+            chunk_stop = min(chunk_start + chunk_size, stop)
+            yield RunChunk(chunk_start, self.columns(chunk_start, chunk_stop))
+
+
+def run_matrix(spec: SweepSpec) -> RunMatrix:
+    """Column-oriented NumPy expansion of a spec."""
+    return RunMatrix(spec)
+
+
+def iter_npy(chunks: Iterator[RunChunk]) -> Iterator[bytes]:
+    """
+    Encode chunks as a stream of concatenated .npy arrays, one per column in
+    schema order for each chunk. Readers call np.load(f) repeatedly on the
+    same file object to pull arrays off the stream.
+    """
+    for chunk in chunks:
+        buf = io.BytesIO()
+        for array in chunk.columns.values():
+            np.lib.format.write_array(buf, array, allow_pickle=False)
+        yield buf.getvalue()
@@ -1,39 +1,201 @@
 import os
 import json
+import time
+import asyncio
+import logging
 import redis.asyncio as redis
+from collections import OrderedDict
 from uuid import UUID, uuid4
-from typing import List, Optional
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Union
 from .models import SweepSpec, StoredSweep
 
+logger = logging.getLogger(__name__)
+
 REDIS_URL = "redis://localhost:6379/0"
 r = redis.from_url(REDIS_URL, decode_responses=True)
 
 KEY_PREFIX = "sweep:"
 RECENT_LIST_KEY = "sweeps:recent"
+RECENT_LIST_SIZE = 100
 
 
-async def save_spec(spec: SweepSpec) -> UUID:
+class CachedSpec(NamedTuple):
+    stored: StoredSweep
+    body: bytes  # stored JSON, ready to be sent as a response body
+    expires_at: Optional[float]
+
+
+class SpecCache:
+    """
+    Bounded in-process LRU cache of StoredSweep lookups with an optional TTL.
+
+    Entries hold both the parsed model and the encoded JSON so hot configs
+    can be served without touching Redis or pydantic. Cross-worker
+    invalidation is driven by Redis keyspace notifications, see
+    watch_invalidations(); the TTL bounds staleness if notifications are
+    unavailable or missed.
+
+    `generation` changes on every invalidation, so a reader that fetched
+    from Redis before an invalidation arrived cannot cache what it read.
+    While `enabled` is False (invalidation events may be missed) nothing is
+    served or stored.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self.generation = 0
+        self._entries: "OrderedDict[UUID, CachedSpec]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, id_: UUID) -> Optional[CachedSpec]:
+        entry = self._entries.get(id_) if self.enabled else None
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            del self._entries[id_]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(id_)
+        self.hits += 1
+        return entry
+
+    def put(
+        self, id_: UUID, stored: StoredSweep, body: bytes, generation: Optional[int] = None
+    ) -> CachedSpec:
+        """
+        Cache an entry and return it. Pass the `generation` seen before the
+        Redis read; if an invalidation happened since, the entry is returned
+        but not stored.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        entry = CachedSpec(stored, body, expires_at)
+        if self.maxsize <= 0 or not self.enabled:
+            return entry
+        if generation is not None and generation != self.generation:
+            return entry
+        self._entries[id_] = entry
+        self._entries.move_to_end(id_)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, id_: UUID) -> None:
+        self.generation += 1
+        self._entries.pop(id_, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "enabled": self.enabled,
+        }
+
+
+_cache_ttl = os.getenv("SPEC_CACHE_TTL")
+spec_cache = SpecCache(
+    maxsize=int(os.getenv("SPEC_CACHE_SIZE", "1024")),
+    ttl=float(_cache_ttl) if _cache_ttl else None,
+)
+
+# TTL forced on the cache when keyspace notifications cannot be enabled
+FALLBACK_CACHE_TTL = 5.0
+
+
+def _queue_save(pipe, spec: SweepSpec) -> UUID:
+    """Queue the writes for one spec on a pipeline and return its new id."""
     id_ = uuid4()
     stored = StoredSweep(id=id_, **spec.dict())
 
-    key = f"{KEY_PREFIX}{id_}"
     # Save the config
-    await r.set(key, stored.json())
-
+    pipe.set(f"{KEY_PREFIX}{id_}", stored.json())
     # Push to recent list (left push = newest first)
-    await r.lpush(RECENT_LIST_KEY, str(id_))
-    # Keep only the last 100 items (trim list)
-    await r.ltrim(RECENT_LIST_KEY, 0, 99)
+    pipe.lpush(RECENT_LIST_KEY, str(id_))
 
     return id_
 
 
-async def get_spec(id_: UUID) -> Optional[StoredSweep]:
+async def save_spec(spec: SweepSpec) -> UUID:
+    # SET + LPUSH + LTRIM go out as one MULTI/EXEC round trip
+    async with r.pipeline(transaction=True) as pipe:
+        id_ = _queue_save(pipe, spec)
+        # Keep only the last 100 items (trim list)
+        pipe.ltrim(RECENT_LIST_KEY, 0, RECENT_LIST_SIZE - 1)
+        await pipe.execute()
+
+    return id_
+
+
+async def save_specs_many(specs: Iterable[SweepSpec]) -> List[UUID]:
+    """
+    Save many specs in a single transaction and return their ids in input order.
+    The recent list is trimmed once at the end, so the newest spec of the
+    batch ends up first.
+    """
+    async with r.pipeline(transaction=True) as pipe:
+        ids = [_queue_save(pipe, spec) for spec in specs]
+        if not ids:
+            return []
+        pipe.ltrim(RECENT_LIST_KEY, 0, RECENT_LIST_SIZE - 1)
+        await pipe.execute()
+
+    return ids
+
+
+async def _load_spec(id_: UUID) -> Optional[CachedSpec]:
+    """Read-through lookup: serve from spec_cache, else fetch, parse and cache."""
+    entry = spec_cache.get(id_)
+    if entry is not None:
+        return entry
+
+    generation = spec_cache.generation
     key = f"{KEY_PREFIX}{id_}"
     data = await r.get(key)
     if not data:
         return None
-    return StoredSweep.parse_raw(data)
+    return spec_cache.put(id_, StoredSweep.parse_raw(data), data.encode(), generation)
+
+
+async def get_spec(id_: UUID) -> Optional[StoredSweep]:
+    entry = await _load_spec(id_)
+    return entry.stored if entry else None
+
+
+async def get_spec_json(id_: UUID) -> Optional[bytes]:
+    """Return the encoded StoredSweep JSON for `id_`, or None if not found."""
+    entry = await _load_spec(id_)
+    return entry.body if entry else None
+
+
+async def get_specs_many(
+    ids: Sequence[UUID], raw: bool = False
+) -> List[Optional[Union[StoredSweep, str]]]:
+    """
+    Fetch many specs with a single MGET, in the order of `ids`.
+    Missing ids come back as None. With raw=True the stored JSON strings are
+    returned untouched so callers can forward them without a parse.
+    """
+    if not ids:
+        return []
+    blobs = await r.mget([f"{KEY_PREFIX}{id_}" for id_ in ids])
+    if raw:
+        return [blob or None for blob in blobs]
+    return [StoredSweep.parse_raw(blob) if blob else None for blob in blobs]
 
 
 async def list_ids() -> List[UUID]:
@@ -45,3 +207,63 @@ async def list_recent_ids(limit: int = 10) -> List[UUID]:
     # Get most recent N IDs from Redis list
     ids = await r.lrange(RECENT_LIST_KEY, 0, limit - 1)
     return [UUID(i) for i in ids]
+
+
+async def _enable_keyspace_events() -> bool:
+    """Turn on the keyspace notifications the cache needs; False if they are unavailable."""
+    try:
+        await r.config_set("notify-keyspace-events", "Kg$xe")
+        return True
+    except redis.RedisError:
+        pass
+    # CONFIG SET may be forbidden while the server is already configured
+    try:
+        flags = (await r.config_get("notify-keyspace-events")).get("notify-keyspace-events", "")
+    except redis.RedisError:
+        return False
+    return "K" in flags and ("A" in flags or all(f in flags for f in "g$x"))
+
+
+async def watch_invalidations(retry_delay: float = 1.0) -> None:
+    """
+    Evict spec_cache entries whenever their Redis key changes, so every worker
+    sharing the Redis instance drops stale entries. Runs until cancelled.
+
+    The cache is disabled until the subscription is up and again whenever it
+    fails, and flushed on every (re)subscribe because events may have been
+    missed meanwhile. Any Redis error is retried. If keyspace notifications
+    cannot be enabled (e.g. CONFIG is forbidden on managed Redis), a TTL of
+    FALLBACK_CACHE_TTL is forced unless SPEC_CACHE_TTL is set.
+    """
+    db = r.connection_pool.connection_kwargs.get("db", 0)
+    pattern = f"__keyspace@{db}__:{KEY_PREFIX}*"
+    prefix_len = len(pattern) - 1
+
+    while True:
+        spec_cache.enabled = False
+        spec_cache.clear()
+        pubsub = r.pubsub(ignore_subscribe_messages=True)
+        try:
+            if not await _enable_keyspace_events() and not spec_cache.ttl:
+                logger.warning(
+                    "Keyspace notifications unavailable; caching specs for %.1fs only",
+                    FALLBACK_CACHE_TTL,
+                )
+                spec_cache.ttl = FALLBACK_CACHE_TTL
+            await pubsub.psubscribe(pattern)
+            spec_cache.clear()
+            spec_cache.enabled = True
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                try:
+                    spec_cache.invalidate(UUID(message["channel"][prefix_len:]))
+                except ValueError:
+                    continue
+        except Exception:
+            logger.warning("Keyspace subscription failed, retrying in %.1fs", retry_delay, exc_info=True)
+            spec_cache.enabled = False
+            spec_cache.clear()
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.aclose()
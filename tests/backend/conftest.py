@@ -11,6 +11,17 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../backend'))
 
 from app.main import app
 from app.models import SweepSpec, Parameter, StoredSweep
+from app.storage import spec_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_spec_cache():
+    """Start every test with an empty in-process spec cache"""
+    spec_cache.clear()
+    spec_cache.enabled = True
+    spec_cache.hits = spec_cache.misses = spec_cache.evictions = 0
+    yield
+    spec_cache.clear()
 
 @pytest.fixture
 def client():
@@ -58,10 +69,18 @@ def mock_redis():
     mock_redis = AsyncMock()
     mock_redis.set = AsyncMock()
     mock_redis.get = AsyncMock()
+    mock_redis.mget = AsyncMock()
     mock_redis.keys = AsyncMock()
     mock_redis.lpush = AsyncMock()
     mock_redis.ltrim = AsyncMock()
     mock_redis.lrange = AsyncMock()
+
+    # Pipelines queue commands synchronously and only await on execute()
+    mock_pipe = MagicMock()
+    mock_pipe.execute = AsyncMock(return_value=[])
+    mock_pipe.__aenter__ = AsyncMock(return_value=mock_pipe)
+    mock_pipe.__aexit__ = AsyncMock(return_value=False)
+    mock_redis.pipeline = MagicMock(return_value=mock_pipe)
     return mock_redis
 
 @pytest.fixture(scope="session")
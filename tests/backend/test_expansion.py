@@ -0,0 +1,115 @@
+import pytest
+from itertools import product
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../backend'))
+
+from app.expansion import SweepExpansion, expand
+from app.models import SweepSpec, Parameter
+
+
+@pytest.fixture
+def reference_runs(sample_sweep_spec):
+    """Eagerly expanded runs of sample_sweep_spec for comparison"""
+    keys = [p.key for p in sample_sweep_spec.parameters]
+    return [dict(zip(keys, combo)) for combo in product(*(p.values for p in sample_sweep_spec.parameters))]
+
+
+@pytest.fixture
+def huge_spec():
+    """10 parameters x 20 values = 20^10 runs"""
+    return SweepSpec(
+        name="Huge",
+        parameters=[
+            Parameter(key=f"p{i}", type="int", values=list(range(20)))
+            for i in range(10)
+        ]
+    )
+
+
+class TestSweepExpansion:
+
+    def test_len(self, sample_sweep_spec):
+        """Test run count is the product of value counts"""
+        runs = expand(sample_sweep_spec)
+        assert len(runs) == 3 * 3 * 2
+        assert runs.size == 18
+
+    def test_iteration_matches_product(self, sample_sweep_spec, reference_runs):
+        """Test iteration order matches itertools.product"""
+        assert list(expand(sample_sweep_spec)) == reference_runs
+
+    def test_random_access(self, sample_sweep_spec, reference_runs):
+        """Test indexing decodes the right run, including negative indices"""
+        runs = expand(sample_sweep_spec)
+        for i in (0, 1, 7, 17):
+            assert runs[i] == reference_runs[i]
+        assert runs[-1] == reference_runs[-1]
+
+    def test_index_out_of_range(self, sample_sweep_spec):
+        """Test out of range indices raise IndexError"""
+        runs = expand(sample_sweep_spec)
+        with pytest.raises(IndexError):
+            runs[18]
+        with pytest.raises(IndexError):
+            runs.run(-1)
+
+    def test_slicing(self, sample_sweep_spec, reference_runs):
+        """Test slices are lazy views with absolute indices"""
+        runs = expand(sample_sweep_spec)
+        page = runs[5:11]
+        assert isinstance(page, SweepExpansion)
+        assert list(page.indices) == list(range(5, 11))
+        assert list(page) == reference_runs[5:11]
+        assert list(runs[::-3]) == reference_runs[::-3]
+        assert list(runs[16:40]) == reference_runs[16:]
+
+    def test_shards_cover_all_runs(self, sample_sweep_spec, reference_runs):
+        """Test shards are disjoint and together cover every run"""
+        runs = expand(sample_sweep_spec)
+        shards = [runs.shard(k, 4) for k in range(4)]
+        assert sum((list(s) for s in shards), []) == reference_runs
+        with pytest.raises(ValueError):
+            runs.shard(4, 4)
+
+    def test_digits_round_trip(self, sample_sweep_spec):
+        """Test mixed-radix encode and decode are inverses"""
+        runs = expand(sample_sweep_spec)
+        for i in range(len(runs)):
+            assert runs.index_of(runs.digits(i)) == i
+
+    def test_no_parameters(self):
+        """Test a spec without parameters has no runs"""
+        runs = expand(SweepSpec(name="Empty", parameters=[]))
+        assert len(runs) == 0
+        assert list(runs) == []
+
+    def test_empty_values(self):
+        """Test a parameter without values yields no runs"""
+        spec = SweepSpec(name="Empty", parameters=[
+            Parameter(key="x", type="float", values=[1.0, 2.0]),
+            Parameter(key="y", type="int", values=[]),
+        ])
+        assert len(expand(spec)) == 0
+
+    def test_huge_sweep_is_lazy(self, huge_spec):
+        """Test a 20^10 run sweep can be counted and paged"""
+        runs = expand(huge_spec)
+        assert len(runs) == 20 ** 10
+        assert runs[-1] == {f"p{i}": 19 for i in range(10)}
+        page = list(runs[10 ** 12:10 ** 12 + 3])
+        assert len(page) == 3
+        assert page[1]["p9"] == page[0]["p9"] + 1
+
+    def test_size_beyond_len_limit(self):
+        """Test size works where len() would overflow"""
+        spec = SweepSpec(name="Huger", parameters=[
+            Parameter(key=f"p{i}", type="int", values=list(range(10)))
+            for i in range(25)
+        ])
+        runs = expand(spec)
+        assert runs.size == 10 ** 25
+        assert runs[10 ** 24]["p0"] == 1
+        with pytest.raises(OverflowError):
+            len(runs)
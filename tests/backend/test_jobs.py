@@ -0,0 +1,202 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from uuid import uuid4
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../backend'))
+
+from app.jobs import Job, JobScheduler, run_batch, stub_solver, load_solver, DONE, FAILED, QUEUED, RUNNING
+from app.models import SweepSpec, Parameter, StoredSweep
+
+
+def echo_solver(params):
+    return {"objective": sum(v for v in params.values() if isinstance(v, (int, float)))}
+
+
+def picky_solver(params):
+    if params["speed"] == 40:
+        raise ValueError("diverged")
+    return {"objective": 1.0}
+
+
+def thread_pool(n):
+    return ThreadPoolExecutor(max_workers=n)
+
+
+async def wait_for_state(job, states, timeout=10):
+    for _ in range(int(timeout / 0.01)):
+        if job.state in states:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job stuck in {job.state}")
+
+
+@pytest.fixture
+def stored_spec(sample_sweep_spec):
+    return StoredSweep(id=uuid4(), **sample_sweep_spec.dict())
+
+
+class TestRunBatch:
+
+    def test_run_batch_outcomes(self):
+        """Test failing runs are reported without aborting the batch"""
+        outcomes = run_batch(picky_solver, [{"speed": 20}, {"speed": 40}, {"speed": 60}])
+        assert [ok for ok, _ in outcomes] == [True, False, True]
+        assert "diverged" in outcomes[1][1]
+
+    def test_stub_solver_deterministic(self):
+        """Test the stub solver is a pure function of the parameters"""
+        params = {"angle": 5.0, "speed": 40, "model": "k-omega"}
+        assert stub_solver(params, iterations=100) == stub_solver(params, iterations=100)
+
+    def test_load_solver(self):
+        """Test solvers can be loaded from a module path"""
+        assert load_solver("app.jobs:stub_solver") is stub_solver
+
+
+class TestJob:
+
+    def test_progress(self, stored_spec):
+        """Test progress is derived from finished runs"""
+        job = Job(stored_spec)
+        assert job.total == 18
+        assert job.snapshot() == {"progress": 0, "state": QUEUED}
+        job.record([(True, {})] * 8 + [(False, "err")])
+        assert job.completed == 8
+        assert job.failed == 1
+        assert job.progress == 50
+
+    def test_empty_sweep_done(self):
+        """Test a finished job without runs reports 100%"""
+        job = Job(StoredSweep(id=uuid4(), name="Empty", parameters=[]))
+        assert job.progress == 0
+        job.state = DONE
+        assert job.progress == 100
+
+
+class TestJobScheduler:
+
+    @pytest.mark.asyncio
+    async def test_runs_without_viewers(self, stored_spec):
+        """Test a submitted job runs to completion on its own"""
+        scheduler = JobScheduler(solver=echo_solver, concurrency=2, batch_size=4,
+                                 executor_factory=thread_pool)
+        await scheduler.start()
+        try:
+            job = scheduler.submit(stored_spec)
+            await wait_for_state(job, (DONE, FAILED))
+            assert job.state == DONE
+            assert job.completed == 18
+            assert job.progress == 100
+        finally:
+            await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_runs_counted(self, stored_spec):
+        """Test runs raising errors are counted as failed"""
+        scheduler = JobScheduler(solver=picky_solver, concurrency=2, batch_size=5,
+                                 executor_factory=thread_pool)
+        await scheduler.start()
+        try:
+            job = scheduler.submit(stored_spec)
+            await wait_for_state(job, (DONE, FAILED))
+            assert job.state == DONE
+            assert job.failed == 6
+            assert job.completed == 12
+        finally:
+            await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_listeners_see_progress(self, stored_spec):
+        """Test listeners are notified of each state change and batch"""
+        seen = []
+
+        async def listener(job):
+            seen.append(job.snapshot())
+
+        scheduler = JobScheduler(solver=echo_solver, concurrency=1, batch_size=6,
+                                 executor_factory=thread_pool)
+        scheduler.listeners.append(listener)
+        await scheduler.start()
+        try:
+            job = scheduler.submit(stored_spec)
+            await wait_for_state(job, (DONE,))
+            await asyncio.sleep(0.05)
+        finally:
+            await scheduler.stop()
+
+        assert seen[0] == {"progress": 0, "state": RUNNING}
+        assert [s["progress"] for s in seen[1:4]] == [33, 66, 100]
+        assert seen[-1] == {"progress": 100, "state": DONE}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, stored_spec):
+        """Test no more than `concurrency` batches are in flight"""
+        import threading
+        import time
+        lock = threading.Lock()
+        active = peak = 0
+
+        def slow_solver(params):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return {}
+
+        scheduler = JobScheduler(solver=slow_solver, concurrency=3, batch_size=1,
+                                 executor_factory=lambda n: ThreadPoolExecutor(max_workers=8))
+        await scheduler.start()
+        try:
+            job = scheduler.submit(stored_spec)
+            await wait_for_state(job, (DONE,))
+        finally:
+            await scheduler.stop()
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_submit_is_idempotent(self, stored_spec):
+        """Test resubmitting a known config returns the existing job"""
+        scheduler = JobScheduler(solver=echo_solver, executor_factory=thread_pool)
+        first = scheduler.submit(stored_spec)
+        assert scheduler.submit(stored_spec) is first
+        assert scheduler.get(str(stored_spec.id)) is first
+
+    @pytest.mark.asyncio
+    async def test_broken_executor_fails_job(self, stored_spec):
+        """Test executor errors mark the job as failed"""
+        def broken_pool(n):
+            pool = ThreadPoolExecutor(max_workers=n)
+            pool.shutdown()
+            return pool
+
+        scheduler = JobScheduler(solver=echo_solver, executor_factory=broken_pool)
+        await scheduler.start()
+        try:
+            job = scheduler.submit(stored_spec)
+            await wait_for_state(job, (DONE, FAILED))
+            assert job.state == FAILED
+            assert "RuntimeError" in job.snapshot()["error"]
+            # Failed jobs can be resubmitted
+            assert scheduler.submit(stored_spec) is not job
+        finally:
+            await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self, stored_spec):
+        """Test runs execute in worker processes with the default executor"""
+        scheduler = JobScheduler(solver=stub_solver, concurrency=2, batch_size=9)
+        await scheduler.start()
+        try:
+            assert isinstance(scheduler._executor, ProcessPoolExecutor)
+            job = scheduler.submit(stored_spec)
+            await wait_for_state(job, (DONE, FAILED), timeout=60)
+            assert job.state == DONE
+            assert job.completed == 18
+        finally:
+            await scheduler.stop()
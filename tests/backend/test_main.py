@@ -1,5 +1,7 @@
+import io
 import pytest
 import json
+import numpy as np
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 from fastapi.testclient import TestClient
@@ -37,6 +39,21 @@ class TestAPIEndpoints:
             assert data["id"] == str(test_id)
             mock_save.assert_called_once()
 
+    def test_create_config_submits_job(self, client, sample_sweep_spec):
+        """Test creating a configuration queues its runs"""
+        with patch('app.main.save_spec') as mock_save, \
+             patch('app.main.scheduler') as mock_scheduler:
+            test_id = uuid4()
+            mock_save.return_value = test_id
+
+            response = client.post("/configs", json=sample_sweep_spec.dict())
+
+            assert response.status_code == 200
+            mock_scheduler.submit.assert_called_once()
+            submitted = mock_scheduler.submit.call_args[0][0]
+            assert submitted.id == test_id
+            assert submitted.name == sample_sweep_spec.name
+
     def test_create_config_invalid_json(self, client):
         """Test creating config with invalid JSON structure"""
         invalid_data = {
@@ -64,8 +81,8 @@ class TestAPIEndpoints:
 
     def test_read_config_exists(self, client, sample_stored_sweep):
         """Test reading an existing configuration"""
-        with patch('app.main.get_spec') as mock_get:
-            mock_get.return_value = sample_stored_sweep
+        with patch('app.main.get_spec_json') as mock_get:
+            mock_get.return_value = sample_stored_sweep.json().encode()
             
             response = client.get(f"/configs/{sample_stored_sweep.id}")
             
@@ -76,7 +93,7 @@ class TestAPIEndpoints:
 
     def test_read_config_not_found(self, client):
         """Test reading a non-existent configuration"""
-        with patch('app.main.get_spec') as mock_get:
+        with patch('app.main.get_spec_json') as mock_get:
             mock_get.return_value = None
             test_id = uuid4()
             
@@ -108,10 +125,10 @@ class TestAPIEndpoints:
         ]
         
         with patch('app.main.list_recent_ids') as mock_list_recent, \
-             patch('app.main.get_spec') as mock_get:
+             patch('app.main.get_specs_many') as mock_get_many:
             
             mock_list_recent.return_value = test_ids
-            mock_get.side_effect = mock_stored_sweeps
+            mock_get_many.return_value = [s.json() for s in mock_stored_sweeps]
             
             response = client.get("/configs/recent")
             
@@ -125,6 +142,11 @@ class TestAPIEndpoints:
                 assert "config" in item
                 assert "name" in item["config"]
 
+            # One batched fetch, in recency order, passing raw blobs through
+            mock_get_many.assert_called_once_with(test_ids, raw=True)
+            assert [item["id"] for item in data] == [str(id_) for id_ in test_ids]
+            assert data[0]["config"]["name"] == "Test 0"
+
     def test_get_recent_configs_custom_limit(self, client):
         """Test getting recent configs with custom limit"""
         test_ids = [uuid4() for _ in range(2)]
@@ -139,10 +161,10 @@ class TestAPIEndpoints:
         ]
         
         with patch('app.main.list_recent_ids') as mock_list_recent, \
-             patch('app.main.get_spec') as mock_get:
+             patch('app.main.get_specs_many') as mock_get_many:
             
             mock_list_recent.return_value = test_ids
-            mock_get.side_effect = mock_stored_sweeps
+            mock_get_many.return_value = [s.json() for s in mock_stored_sweeps]
             
             response = client.get("/configs/recent?limit=2")
             
@@ -173,11 +195,11 @@ class TestAPIEndpoints:
         )
         
         with patch('app.main.list_recent_ids') as mock_list_recent, \
-             patch('app.main.get_spec') as mock_get:
+             patch('app.main.get_specs_many') as mock_get_many:
             
             mock_list_recent.return_value = test_ids
             # First ID returns data, second returns None
-            mock_get.side_effect = [mock_stored_sweep, None]
+            mock_get_many.return_value = [mock_stored_sweep.json(), None]
             
             response = client.get("/configs/recent")
             
@@ -187,6 +209,93 @@ class TestAPIEndpoints:
             assert len(data) == 1
             assert data[0]["id"] == str(test_ids[0])
 
+    def test_read_config_runs_first_page(self, client, sample_sweep_spec):
+        """Test paging the expanded runs of a configuration"""
+        stored = StoredSweep(id=uuid4(), **sample_sweep_spec.dict())
+        with patch('app.main.get_spec') as mock_get:
+            mock_get.return_value = stored
+
+            response = client.get(f"/configs/{stored.id}/runs?limit=4")
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 18
+            assert data["offset"] == 0
+            assert [run["index"] for run in data["runs"]] == [0, 1, 2, 3]
+            assert data["runs"][0]["params"] == {"angle": 0, "speed": 20, "model": "k-epsilon"}
+            assert data["runs"][1]["params"] == {"angle": 0, "speed": 20, "model": "k-omega"}
+
+    def test_read_config_runs_last_page(self, client, sample_sweep_spec):
+        """Test the last page is truncated at the end of the sweep"""
+        stored = StoredSweep(id=uuid4(), **sample_sweep_spec.dict())
+        with patch('app.main.get_spec') as mock_get:
+            mock_get.return_value = stored
+
+            response = client.get(f"/configs/{stored.id}/runs?offset=16&limit=10")
+
+            assert response.status_code == 200
+            data = response.json()
+            assert [run["index"] for run in data["runs"]] == [16, 17]
+            assert data["runs"][-1]["params"] == {"angle": 10, "speed": 60, "model": "k-omega"}
+
+    def test_read_config_runs_not_found(self, client):
+        """Test paging runs of a non-existent configuration"""
+        with patch('app.main.get_spec') as mock_get:
+            mock_get.return_value = None
+
+            response = client.get(f"/configs/{uuid4()}/runs")
+
+            assert response.status_code == 404
+
+    def test_read_config_runs_invalid_paging(self, client):
+        """Test paging parameters are validated"""
+        response = client.get(f"/configs/{uuid4()}/runs?offset=-1")
+        assert response.status_code == 422
+        response = client.get(f"/configs/{uuid4()}/runs?limit=0")
+        assert response.status_code == 422
+
+    def test_read_config_matrix_schema(self, client, sample_sweep_spec):
+        """Test describing the run matrix columns of a configuration"""
+        stored = StoredSweep(id=uuid4(), **sample_sweep_spec.dict())
+        with patch('app.main.get_spec') as mock_get:
+            mock_get.return_value = stored
+
+            response = client.get(f"/configs/{stored.id}/matrix")
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 18
+            assert [c["key"] for c in data["columns"]] == ["angle", "speed", "model"]
+
+    def test_stream_config_matrix(self, client, sample_sweep_spec):
+        """Test streaming the run matrix as concatenated .npy arrays"""
+        stored = StoredSweep(id=uuid4(), **sample_sweep_spec.dict())
+        with patch('app.main.get_spec') as mock_get:
+            mock_get.return_value = stored
+
+            response = client.get(f"/configs/{stored.id}/matrix.npy?offset=2&limit=5&chunk_size=3")
+
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/octet-stream"
+            assert response.headers["x-run-columns"] == "angle,speed,model"
+            stream = io.BytesIO(response.content)
+            angle, speed, model = (np.load(stream) for _ in range(3))
+            assert list(model) == [0, 1, 0]
+            assert list(speed) == [40, 40, 60]
+            assert len(np.load(stream)) == 2
+
+    def test_stream_config_matrix_invalid_values(self, client):
+        """Test a config with non-numeric float values cannot be streamed"""
+        stored = StoredSweep(id=uuid4(), name="Bad", parameters=[
+            Parameter(key="x", type="float", values=["a"])
+        ])
+        with patch('app.main.get_spec') as mock_get:
+            mock_get.return_value = stored
+
+            response = client.get(f"/configs/{stored.id}/matrix.npy")
+
+            assert response.status_code == 422
+
 class TestAPIValidation:
     
     def test_parameter_validation_empty_key(self, client):
@@ -262,4 +371,27 @@ class TestCORSHeaders:
         })
         
         assert response.status_code == 200
-        # The response should not be blocked by CORS
\ No newline at end of file
+        # The response should not be blocked by CORS
+
+class TestProgressWebSocket:
+
+    def test_ws_sends_job_state(self, client, sample_stored_sweep):
+        """Test a viewer receives the job state and viewer count on connect"""
+        with patch('app.main.get_spec') as mock_get, \
+             patch('app.main.scheduler.jobs', {}):
+            mock_get.return_value = sample_stored_sweep
+
+            with client.websocket_connect(f"/ws/configs/{sample_stored_sweep.id}") as ws:
+                data = ws.receive_json()
+
+            assert data == {"progress": 0, "state": "QUEUED", "viewers": 1}
+
+    def test_ws_unknown_config(self, client):
+        """Test a viewer of an unknown config is told it does not exist"""
+        with patch('app.main.get_spec') as mock_get:
+            mock_get.return_value = None
+
+            with client.websocket_connect(f"/ws/configs/{uuid4()}") as ws:
+                data = ws.receive_json()
+
+            assert data["state"] == "NOT_FOUND"
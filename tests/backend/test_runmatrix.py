@@ -0,0 +1,107 @@
+import io
+import pytest
+import numpy as np
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../backend'))
+
+from app.expansion import expand
+from app.runmatrix import RunMatrix, code_dtype, iter_npy, run_matrix
+from app.models import SweepSpec, Parameter
+
+
+def decoded(matrix, columns):
+    """Turn column arrays back into per-run dicts for comparison"""
+    n = len(next(iter(columns.values())))
+    runs = []
+    for i in range(n):
+        run = {}
+        for key in matrix.keys:
+            value = columns[key][i]
+            run[key] = matrix.categories[key][value] if key in matrix.categories else value.item()
+        runs.append(run)
+    return runs
+
+
+class TestRunMatrix:
+
+    def test_dtypes(self, sample_sweep_spec):
+        """Test numeric columns are 64-bit and categoricals are compact codes"""
+        columns = run_matrix(sample_sweep_spec).columns()
+        assert columns["angle"].dtype == np.float64
+        assert columns["speed"].dtype == np.int64
+        assert columns["model"].dtype == np.uint8
+
+    def test_matches_expansion(self, sample_sweep_spec):
+        """Test the column arrays hold the same runs as SweepExpansion"""
+        matrix = run_matrix(sample_sweep_spec)
+        assert decoded(matrix, matrix.columns()) == list(expand(sample_sweep_spec))
+
+    def test_categories(self, sample_sweep_spec):
+        """Test enum parameters expose their categories table"""
+        matrix = run_matrix(sample_sweep_spec)
+        assert matrix.categories == {"model": ["k-epsilon", "k-omega"]}
+        assert list(matrix.columns()["model"][:4]) == [0, 1, 0, 1]
+
+    def test_chunks(self, sample_sweep_spec):
+        """Test chunks are bounded in size and cover the requested range"""
+        matrix = run_matrix(sample_sweep_spec)
+        chunks = list(matrix.chunks(chunk_size=4, start=3))
+        assert [c.start for c in chunks] == [3, 7, 11, 15]
+        assert [len(c) for c in chunks] == [4, 4, 4, 3]
+        runs = sum((decoded(matrix, c.columns) for c in chunks), [])
+        assert runs == list(expand(sample_sweep_spec))[3:]
+
+    def test_chunks_invalid_size(self, sample_sweep_spec):
+        """Test chunk_size must be positive"""
+        with pytest.raises(ValueError):
+            list(run_matrix(sample_sweep_spec).chunks(chunk_size=0))
+
+    def test_offsets_beyond_int64(self):
+        """Test chunks deep inside a sweep larger than 2^63 runs"""
+        spec = SweepSpec(name="Huge", parameters=[
+            Parameter(key=f"p{i}", type="int", values=list(range(10)))
+            for i in range(25)
+        ])
+        matrix = run_matrix(spec)
+        start = 10 ** 25 - 3
+        columns = matrix.columns(start, start + 3)
+        assert decoded(matrix, columns) == list(expand(spec)[start:])
+
+    def test_invalid_numeric_values(self):
+        """Test non-numeric values in numeric parameters are rejected"""
+        spec = SweepSpec(name="Bad", parameters=[
+            Parameter(key="x", type="float", values=[1.0, "fast"]),
+        ])
+        with pytest.raises(ValueError):
+            RunMatrix(spec)
+        spec = SweepSpec(name="Bad", parameters=[
+            Parameter(key="n", type="int", values=[1, 2.5]),
+        ])
+        with pytest.raises(ValueError):
+            RunMatrix(spec)
+
+    def test_code_dtype(self):
+        """Test category codes use the smallest dtype that fits"""
+        assert code_dtype(256) == np.uint8
+        assert code_dtype(257) == np.uint16
+        assert code_dtype(70000) == np.uint32
+
+    def test_schema(self, sample_sweep_spec):
+        """Test the schema lists columns in order with dtypes"""
+        schema = run_matrix(sample_sweep_spec).schema()
+        assert schema["total"] == 18
+        assert [c["key"] for c in schema["columns"]] == ["angle", "speed", "model"]
+        assert schema["columns"][2]["categories"] == ["k-epsilon", "k-omega"]
+        assert np.dtype(schema["columns"][0]["dtype"]) == np.float64
+
+    def test_npy_stream(self, sample_sweep_spec):
+        """Test the .npy stream reads back with repeated np.load calls"""
+        matrix = run_matrix(sample_sweep_spec)
+        stream = io.BytesIO(b"".join(iter_npy(matrix.chunks(chunk_size=10))))
+        first = [np.load(stream) for _ in matrix.keys]
+        second = [np.load(stream) for _ in matrix.keys]
+        assert [len(a) for a in first] == [10, 10, 10]
+        assert [len(a) for a in second] == [8, 8, 8]
+        assert stream.read() == b""
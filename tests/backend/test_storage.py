@@ -1,12 +1,18 @@
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, patch
+import fakeredis
+import redis.asyncio as redis
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4, UUID
 
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../backend'))
 
-from app.storage import save_spec, get_spec, list_ids, list_recent_ids
+from app.storage import (
+    save_spec, save_specs_many, get_spec, get_spec_json, get_specs_many, list_ids, list_recent_ids,
+    SpecCache, spec_cache, watch_invalidations, FALLBACK_CACHE_TTL,
+)
 from app.models import SweepSpec, Parameter, StoredSweep
 
 class TestStorage:
@@ -21,13 +27,17 @@ class TestStorage:
             # Verify UUID was returned
             assert isinstance(result_id, UUID)
             
-            # Verify Redis operations were called
-            mock_redis.set.assert_called_once()
-            mock_redis.lpush.assert_called_once_with("sweeps:recent", str(result_id))
-            mock_redis.ltrim.assert_called_once_with("sweeps:recent", 0, 99)
+            # Verify Redis operations were queued on a single transaction
+            mock_redis.pipeline.assert_called_once_with(transaction=True)
+            mock_pipe = mock_redis.pipeline.return_value
+            mock_pipe.set.assert_called_once()
+            mock_pipe.lpush.assert_called_once_with("sweeps:recent", str(result_id))
+            mock_pipe.ltrim.assert_called_once_with("sweeps:recent", 0, 99)
+            mock_pipe.execute.assert_awaited_once()
+            mock_redis.set.assert_not_called()
             
             # Verify the stored data structure
-            call_args = mock_redis.set.call_args
+            call_args = mock_pipe.set.call_args
             stored_key = call_args[0][0]
             assert stored_key.startswith("sweep:")
             assert str(result_id) in stored_key
@@ -68,6 +78,48 @@ class TestStorage:
             expected_key = f"sweep:{test_id}"
             mock_redis.get.assert_called_once_with(expected_key)
 
+    @pytest.mark.asyncio
+    async def test_get_specs_many(self, sample_stored_sweep, mock_redis):
+        """Test batch retrieval keeps order and maps misses to None"""
+        missing_id = uuid4()
+        mock_redis.mget.return_value = [sample_stored_sweep.json(), None]
+
+        with patch('app.storage.r', mock_redis):
+            result = await get_specs_many([sample_stored_sweep.id, missing_id])
+
+            assert len(result) == 2
+            assert isinstance(result[0], StoredSweep)
+            assert result[0].id == sample_stored_sweep.id
+            assert result[1] is None
+
+            # A single MGET for every id
+            mock_redis.mget.assert_called_once_with(
+                [f"sweep:{sample_stored_sweep.id}", f"sweep:{missing_id}"]
+            )
+            mock_redis.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_specs_many_raw(self, sample_stored_sweep, mock_redis):
+        """Test raw batch retrieval returns stored JSON without parsing"""
+        blob = sample_stored_sweep.json()
+        mock_redis.mget.return_value = [blob]
+
+        with patch('app.storage.r', mock_redis), \
+             patch('app.storage.StoredSweep.parse_raw') as mock_parse:
+            result = await get_specs_many([sample_stored_sweep.id], raw=True)
+
+            assert result == [blob]
+            mock_parse.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_specs_many_empty(self, mock_redis):
+        """Test batch retrieval of no ids skips Redis"""
+        with patch('app.storage.r', mock_redis):
+            result = await get_specs_many([])
+
+            assert result == []
+            mock_redis.mget.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_list_ids(self, mock_redis):
         """Test listing all specification IDs"""
@@ -146,7 +198,7 @@ class TestStorage:
             stored_data = value
             return AsyncMock()
         
-        mock_redis.set.side_effect = capture_set
+        mock_redis.pipeline.return_value.set.side_effect = capture_set
         
         with patch('app.storage.r', mock_redis):
             # Save the spec
@@ -165,6 +217,33 @@ class TestStorage:
             assert retrieved.description == sample_sweep_spec.description
             assert len(retrieved.parameters) == len(sample_sweep_spec.parameters)
 
+    @pytest.mark.asyncio
+    async def test_save_specs_many(self, sample_sweep_spec, mock_redis):
+        """Test saving several specifications in one pipeline"""
+        with patch('app.storage.r', mock_redis):
+            result_ids = await save_specs_many([sample_sweep_spec] * 3)
+
+            assert len(result_ids) == 3
+            assert len(set(result_ids)) == 3
+
+            # One transaction, one trim, one round trip
+            mock_redis.pipeline.assert_called_once_with(transaction=True)
+            mock_pipe = mock_redis.pipeline.return_value
+            assert mock_pipe.set.call_count == 3
+            pushed = [c.args[1] for c in mock_pipe.lpush.call_args_list]
+            assert pushed == [str(id_) for id_ in result_ids]
+            mock_pipe.ltrim.assert_called_once_with("sweeps:recent", 0, 99)
+            mock_pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_save_specs_many_empty(self, mock_redis):
+        """Test saving an empty batch does not hit Redis"""
+        with patch('app.storage.r', mock_redis):
+            result_ids = await save_specs_many([])
+
+            assert result_ids == []
+            mock_redis.pipeline.return_value.execute.assert_not_called()
+
 class TestStorageEdgeCases:
     
     @pytest.mark.asyncio
@@ -192,4 +271,185 @@ class TestStorageEdgeCases:
         
         with patch('app.storage.r', mock_redis):
             result_id = await save_spec(complex_spec)
-            assert isinstance(result_id, UUID)
\ No newline at end of file
+            assert isinstance(result_id, UUID)
+
+class TestSpecCache:
+
+    def test_lru_eviction(self, sample_stored_sweep):
+        """Test least recently used entries are evicted first"""
+        cache = SpecCache(maxsize=2)
+        a, b, c = uuid4(), uuid4(), uuid4()
+        cache.put(a, sample_stored_sweep, b"a")
+        cache.put(b, sample_stored_sweep, b"b")
+        cache.get(a)  # a becomes most recent
+        cache.put(c, sample_stored_sweep, b"c")
+
+        assert cache.get(b) is None
+        assert cache.get(a).body == b"a"
+        assert cache.get(c).body == b"c"
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self, sample_stored_sweep):
+        """Test entries expire after the TTL"""
+        cache = SpecCache(maxsize=10, ttl=5)
+        id_ = uuid4()
+        with patch('app.storage.time.monotonic', return_value=100.0):
+            cache.put(id_, sample_stored_sweep, b"x")
+        with patch('app.storage.time.monotonic', return_value=104.0):
+            assert cache.get(id_) is not None
+        with patch('app.storage.time.monotonic', return_value=105.0):
+            assert cache.get(id_) is None
+        assert len(cache) == 0
+
+    def test_hit_miss_counters(self, sample_stored_sweep):
+        """Test hit and miss counters"""
+        cache = SpecCache(maxsize=10)
+        id_ = uuid4()
+        cache.get(id_)
+        cache.put(id_, sample_stored_sweep, b"x")
+        cache.get(id_)
+        cache.get(id_)
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_disabled_cache(self, sample_stored_sweep):
+        """Test maxsize=0 disables caching"""
+        cache = SpecCache(maxsize=0)
+        id_ = uuid4()
+        entry = cache.put(id_, sample_stored_sweep, b"x")
+
+        assert entry.body == b"x"
+        assert cache.get(id_) is None
+
+    @pytest.mark.asyncio
+    async def test_get_spec_read_through(self, sample_stored_sweep, mock_redis):
+        """Test repeated lookups are served from the cache"""
+        mock_redis.get.return_value = sample_stored_sweep.json()
+
+        with patch('app.storage.r', mock_redis):
+            first = await get_spec(sample_stored_sweep.id)
+            second = await get_spec(sample_stored_sweep.id)
+            body = await get_spec_json(sample_stored_sweep.id)
+
+            assert first is second
+            assert body == sample_stored_sweep.json().encode()
+            mock_redis.get.assert_called_once()
+            assert spec_cache.hits == 2
+            assert spec_cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_get_spec_after_invalidate(self, sample_stored_sweep, mock_redis):
+        """Test invalidated entries are fetched again from Redis"""
+        mock_redis.get.return_value = sample_stored_sweep.json()
+
+        with patch('app.storage.r', mock_redis):
+            await get_spec(sample_stored_sweep.id)
+            spec_cache.invalidate(sample_stored_sweep.id)
+            await get_spec(sample_stored_sweep.id)
+
+            assert mock_redis.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_spec_miss_not_cached(self, mock_redis):
+        """Test missing configs are not cached"""
+        mock_redis.get.return_value = None
+        test_id = uuid4()
+
+        with patch('app.storage.r', mock_redis):
+            assert await get_spec(test_id) is None
+            assert await get_spec(test_id) is None
+
+            assert mock_redis.get.call_count == 2
+            assert len(spec_cache) == 0
+
+    def test_put_after_invalidation_dropped(self, sample_stored_sweep):
+        """Test a read that raced with an invalidation is not cached"""
+        cache = SpecCache(maxsize=10)
+        id_ = uuid4()
+        generation = cache.generation
+        cache.invalidate(id_)  # arrives while the Redis GET is in flight
+        entry = cache.put(id_, sample_stored_sweep, b"stale", generation)
+
+        assert entry.body == b"stale"
+        assert cache.get(id_) is None
+
+    def test_disabled_serves_nothing(self, sample_stored_sweep):
+        """Test a disabled cache neither stores nor serves entries"""
+        cache = SpecCache(maxsize=10)
+        id_ = uuid4()
+        cache.put(id_, sample_stored_sweep, b"x")
+        cache.enabled = False
+        assert cache.get(id_) is None
+        cache.put(uuid4(), sample_stored_sweep, b"y")
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_spec_races_invalidation(self, sample_stored_sweep, mock_redis):
+        """Test an invalidation during the Redis read keeps the result out of the cache"""
+        async def get_then_invalidate(key):
+            spec_cache.invalidate(sample_stored_sweep.id)
+            return sample_stored_sweep.json()
+
+        mock_redis.get.side_effect = get_then_invalidate
+        with patch('app.storage.r', mock_redis):
+            assert await get_spec(sample_stored_sweep.id) is not None
+            assert len(spec_cache) == 0
+
+
+class TestWatchInvalidations:
+
+    @pytest.mark.asyncio
+    async def test_evicts_on_key_change(self, sample_stored_sweep):
+        """Test a write to a cached key from anywhere evicts it"""
+        fake = fakeredis.FakeAsyncRedis(decode_responses=True)
+        await fake.set(f"sweep:{sample_stored_sweep.id}", sample_stored_sweep.json())
+        with patch('app.storage.r', fake):
+            task = asyncio.create_task(watch_invalidations(retry_delay=0.01))
+            try:
+                for _ in range(100):
+                    if spec_cache.enabled:
+                        break
+                    await asyncio.sleep(0.01)
+                await get_spec(sample_stored_sweep.id)
+                assert len(spec_cache) == 1
+
+                await fake.delete(f"sweep:{sample_stored_sweep.id}")
+                for _ in range(100):
+                    if not len(spec_cache):
+                        break
+                    await asyncio.sleep(0.01)
+                assert len(spec_cache) == 0
+            finally:
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+    @pytest.mark.asyncio
+    async def test_survives_non_connection_errors(self):
+        """Test ACL/response errors are retried and leave the cache disabled"""
+        pubsub = MagicMock()
+        pubsub.psubscribe = AsyncMock(side_effect=redis.ResponseError("NOPERM"))
+        pubsub.aclose = AsyncMock()
+        failing = MagicMock()
+        failing.connection_pool.connection_kwargs = {"db": 0}
+        failing.config_set = AsyncMock(side_effect=redis.ResponseError("unknown command"))
+        failing.config_get = AsyncMock(side_effect=redis.ResponseError("unknown command"))
+        failing.pubsub.return_value = pubsub
+
+        with patch('app.storage.r', failing), patch.object(spec_cache, 'ttl', None):
+            task = asyncio.create_task(watch_invalidations(retry_delay=0.01))
+            await asyncio.sleep(0.1)
+            try:
+                assert not task.done()
+                assert pubsub.psubscribe.await_count > 1
+                assert spec_cache.enabled is False
+                # Notifications are unavailable, so a TTL is forced
+                assert spec_cache.ttl == FALLBACK_CACHE_TTL
+            finally:
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
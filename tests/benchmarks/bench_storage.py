@@ -0,0 +1,133 @@
+"""
+Storage write benchmark against an in-process fakeredis TCP server.
+
+Compares the old three-round-trip save (SET, LPUSH, LTRIM awaited one by one)
+with the pipelined save_spec and the bulk save_specs_many path. A loopback
+fakeredis has almost no network latency, so every round trip is delayed by
+--rtt-ms to model a Redis on another host.
+
+Usage (from the project root):
+    python tests/benchmarks/bench_storage.py --n 2000 --concurrency 50 --rtt-ms 1
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import os
+import threading
+import time
+from contextlib import closing
+from uuid import uuid4
+
+import redis.asyncio as redis
+from fakeredis import TcpFakeServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../backend'))
+
+from app import storage
+from app.models import SweepSpec, Parameter, StoredSweep
+
+
+class LatencyConnection(redis.Connection):
+    """Connection that waits `rtt` seconds per request sent (one per round trip)."""
+    rtt = 0.0
+
+    async def send_packed_command(self, command, check_health=True):
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+        await super().send_packed_command(command, check_health)
+
+
+def make_spec(n_values: int = 10) -> SweepSpec:
+    return SweepSpec(
+        name="Bench Sweep",
+        description="Storage benchmark",
+        parameters=[
+            Parameter(key="angle", type="float", values=[i * 0.5 for i in range(n_values)]),
+            Parameter(key="speed", type="int", values=list(range(n_values))),
+            Parameter(key="model", type="enum", values=["k-epsilon", "k-omega"]),
+        ],
+    )
+
+
+async def legacy_save_spec(spec: SweepSpec):
+    """The pre-pipeline implementation, kept here only as a baseline."""
+    r = storage.r
+    id_ = uuid4()
+    stored = StoredSweep(id=id_, **spec.dict())
+    await r.set(f"{storage.KEY_PREFIX}{id_}", stored.json())
+    await r.lpush(storage.RECENT_LIST_KEY, str(id_))
+    await r.ltrim(storage.RECENT_LIST_KEY, 0, 99)
+    return id_
+
+
+async def run_concurrent(save, spec: SweepSpec, n: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await save(spec)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return n / (time.perf_counter() - start)
+
+
+async def run_bulk(spec: SweepSpec, n: int, batch: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, n, batch):
+        await storage.save_specs_many([spec] * min(batch, n - i))
+    return n / (time.perf_counter() - start)
+
+
+class NoDelayFakeServer(TcpFakeServer):
+    """Real Redis sets TCP_NODELAY; without it Nagle stalls multi-reply pipelines."""
+
+    def get_request(self):
+        conn, addr = super().get_request()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, addr
+
+
+def start_server() -> int:
+    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = NoDelayFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return port
+
+
+async def main(args):
+    port = start_server()
+    LatencyConnection.rtt = args.rtt_ms / 1000
+    storage.r = redis.from_url(
+        f"redis://127.0.0.1:{port}/0",
+        decode_responses=True,
+        connection_class=LatencyConnection,
+    )
+    spec = make_spec(args.values)
+
+    # Warm up connections before timing
+    await run_concurrent(storage.save_spec, spec, args.concurrency, args.concurrency)
+
+    before = await run_concurrent(legacy_save_spec, spec, args.n, args.concurrency)
+    after = await run_concurrent(storage.save_spec, spec, args.n, args.concurrency)
+    bulk = await run_bulk(spec, args.n, args.batch)
+
+    print(f"n={args.n} concurrency={args.concurrency} rtt={args.rtt_ms}ms")
+    print(f"legacy save (3 round trips):   {before:10.1f} req/s")
+    print(f"pipelined save_spec:           {after:10.1f} req/s  ({after / before:.2f}x)")
+    print(f"save_specs_many (batch={args.batch:<4}): {bulk:10.1f} specs/s ({bulk / before:.2f}x)")
+
+    await storage.r.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=2000, help="specs to save per mode")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=100, help="batch size for save_specs_many")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated round-trip latency")
+    parser.add_argument("--values", type=int, default=10, help="values per parameter")
+    asyncio.run(main(parser.parse_args()))